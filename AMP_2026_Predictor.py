@@ -1,5 +1,21 @@
+import math
+from datetime import date as _date
+from functools import lru_cache
+
 import numpy as np
-from datetime import datetime
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    # Sin numba: los núcleos se ejecutan como Python puro.
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
 # ==============================================================================
 # ARTEFACTO COMPUTACIONAL: PREDICTOR DE MODULACIÓN ANUAL (AMP-2026)
@@ -7,12 +23,194 @@ from datetime import datetime
 # Autores: Prometheus Research
 # ==============================================================================
 
+# Días por mes y días acumulados antes de cada mes (años comunes y bisiestos).
+# Las tuplas sirven al analizador escalar; los arrays, al vectorizado.
+_MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_CUM_DAYS = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+_CUM_DAYS_LEAP = (0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335)
+_MONTH_LEN = np.array(_MONTH_DAYS)
+_CUM = np.array(_CUM_DAYS)
+_CUM_LEAP = np.array(_CUM_DAYS_LEAP)
+
+
+def _is_leap(year):
+    return (year % 4 == 0 and year % 100 != 0) or year % 400 == 0
+
+
+def _parse_iso_year(date_str):
+    """
+    Extrae el año de una cadena 'YYYY-MM-DD'.
+    Lanza ValueError si la cadena no tiene exactamente ese formato: a
+    diferencia de datetime.strptime, no se aceptan mes ni día sin el cero
+    inicial ('2026-6-4').
+    """
+    if len(date_str) != 10 or not date_str.isascii() or date_str[4] != '-' or date_str[7] != '-':
+        raise ValueError(date_str)
+    year = date_str[0:4]
+    if not year.isdigit():
+        raise ValueError(date_str)
+    return int(year)
+
+
+def _parse_iso_day_of_year(date_str, year):
+    """
+    Calcula el día del año de una cadena 'YYYY-MM-DD' ya validada por
+    _parse_iso_year. Lanza ValueError si el mes o el día no son válidos.
+    """
+    month = date_str[5:7]
+    day = date_str[8:10]
+    if not (month.isdigit() and day.isdigit()):
+        raise ValueError(date_str)
+    month = int(month)
+    day = int(day)
+    if not 1 <= month <= 12:
+        raise ValueError(date_str)
+    leap = _is_leap(year)
+    if not 1 <= day <= _MONTH_DAYS[month - 1] + (leap and month == 2):
+        raise ValueError(date_str)
+    return (_CUM_DAYS_LEAP if leap else _CUM_DAYS)[month - 1] + day
+
+
+def _parse_iso_date(date_str):
+    """
+    Convierte una cadena 'YYYY-MM-DD' en (año, día del año).
+    Lanza ValueError si la cadena no es una fecha válida.
+    """
+    year = _parse_iso_year(date_str)
+    return year, _parse_iso_day_of_year(date_str, year)
+
+
+@lru_cache(maxsize=16)
+def _jan1_ordinal(year):
+    return _date(year, 1, 1).toordinal()
+
+
+def _day_of_year(date_obj):
+    """
+    Día del año de un objeto date/datetime, sin construir un struct_time.
+    """
+    return date_obj.toordinal() - _jan1_ordinal(date_obj.year) + 1
+
+
+def _parse_iso_dates(date_strs):
+    """
+    Versión vectorizada de _parse_iso_date para una secuencia de cadenas.
+    Devuelve dos np.ndarray (años, días del año).
+    """
+    strs = np.asarray(date_strs, dtype=np.str_).reshape(-1)
+    if np.any(np.char.str_len(strs) != 10):
+        raise ValueError("Formato de fecha inválido. Use 'YYYY-MM-DD'.")
+    chars = strs.astype('S10').view(np.uint8).reshape(-1, 10).astype(np.int32) - ord('0')
+    digits = chars[:, [0, 1, 2, 3, 5, 6, 8, 9]]
+    if np.any((digits < 0) | (digits > 9)) or np.any(chars[:, [4, 7]] != ord('-') - ord('0')):
+        raise ValueError("Formato de fecha inválido. Use 'YYYY-MM-DD'.")
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 4] * 10 + digits[:, 5]
+    day = digits[:, 6] * 10 + digits[:, 7]
+    if np.any((month < 1) | (month > 12)):
+        raise ValueError("Formato de fecha inválido. Use 'YYYY-MM-DD'.")
+    leap = ((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0)
+    month_len = _MONTH_LEN[month - 1] + (leap & (month == 2))
+    if np.any((day < 1) | (day > month_len)):
+        raise ValueError("Formato de fecha inválido. Use 'YYYY-MM-DD'.")
+    cum = np.where(leap, _CUM_LEAP[month - 1], _CUM[month - 1])
+    return year, cum + day
+
+# fastmath sin 'nnan' ni 'ninf': un día NaN debe propagarse como NaN y no
+# confundirse con la tasa base 1.
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+
+@njit(cache=True, fastmath=_FASTMATH, nogil=True)
+def _signal_rate_kernel(doy, peak, width, enh, rho, k):
+    """
+    Núcleo escalar densidad -> probabilidad -> tasa de eventos relativa.
+    """
+    x = (doy - peak) / width
+    dens = 1.0 + (enh - 1.0) * math.exp(-0.5 * x * x)
+    if dens < rho:
+        return 1.0
+    return 1.0 + 100.0 * math.tanh(k * (dens / rho - 1.0))
+
+
+@njit(parallel=True, fastmath=_FASTMATH, cache=True, nogil=True)
+def _signal_rate_array(out, doys, peak, width, enh, rho, k, u_crit):
+    """
+    Versión por lotes de _signal_rate_kernel; escribe en el búfer `out`.
+    Los días con x^2 > u_crit quedan bajo la densidad crítica y valen 1
+    sin evaluar exp ni tanh.
+    """
+    for i in prange(doys.shape[0]):
+        x = (doys[i] - peak) / width
+        if x * x > u_crit:
+            out[i] = 1.0
+        else:
+            out[i] = _signal_rate_kernel(doys[i], peak, width, enh, rho, k)
+
+
+class _PredictionBatch:
+    """
+    Acumula fechas 'YYYY-MM-DD' y las evalúa juntas con una única consulta
+    vectorizada a la tabla de tasas del predictor.
+    """
+
+    def __init__(self, predictor):
+        self._predictor = predictor
+        self._pending_years = []
+        self._pending_doys = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def add(self, date_str):
+        """
+        Añade una fecha al lote. Lanza ValueError si la cadena es inválida.
+        """
+        year, day_of_year = _parse_iso_date(date_str)
+        self._pending_years.append(year)
+        self._pending_doys.append(day_of_year)
+
+    def result(self):
+        """
+        Devuelve las tasas de eventos relativas de las fechas añadidas, en orden.
+        Las fechas fuera del año objetivo dan NaN.
+        """
+        years = np.asarray(self._pending_years, dtype=np.int32)
+        doys = np.asarray(self._pending_doys, dtype=np.int16)
+        rates = self._predictor._rate_table[doys]
+        rates[years != self._predictor.target_year] = np.nan
+        return rates
+
+    def flush(self):
+        """
+        Como result(), pero además vacía el lote.
+        """
+        rates = self.result()
+        self._pending_years.clear()
+        self._pending_doys.clear()
+        return rates
+
+
 class AnnualModulationPredictor:
     """
     Implementa el modelo predictivo para la modulación anual de la materia oscura
     basado en el modelo de transición de fase dependiente de la densidad.
     """
 
+    __slots__ = (
+        'target_year',
+        'filament_peak_day_of_year',
+        'filament_width_days',
+        'density_enhancement_factor',
+        'rho_crit_normalized',
+        'k_factor',
+        '_rate_table',
+        '_u_crit',
+    )
+
     def __init__(self, year=2026):
         """
         Inicializa los parámetros del modelo para un año específico.
@@ -27,44 +225,153 @@ class AnnualModulationPredictor:
         self.rho_crit_normalized = 5.0         # Densidad crítica de transición (unidades normalizadas)
         self.k_factor = 2.5                    # Factor de rapidez de la transición
 
-    def get_relative_density_at_date(self, date_obj):
+        # Tabla de tasas precalculada, indexada por día del año (el índice 0 no se usa)
+        density = self.get_relative_density_at_date(np.arange(367))
+        self._rate_table = 1.0 + 100 * self.get_phase_transition_probability(density)
+        self._rate_table.setflags(write=False)
+
+        # Umbral en x^2 = ((doy - pico) / ancho)^2 a partir del cual la densidad
+        # queda bajo rho_crit y la tasa vale exactamente 1.
+        if self.rho_crit_normalized > 1 and self.density_enhancement_factor > 1:
+            self._u_crit = 2 * math.log(
+                (self.density_enhancement_factor - 1) / (self.rho_crit_normalized - 1)
+            )
+        else:
+            self._u_crit = float(np.finfo(np.float64).max)
+
+    def get_relative_density_at_date(self, doy):
         """
         Calcula la densidad relativa de materia oscura en la posición de la Tierra
-        para una fecha dada.
+        para un día del año (escalar o np.ndarray; admite fracciones de día).
         """
-        day_of_year = date_obj.timetuple().tm_yday
-        exponent = -0.5 * ((day_of_year - self.filament_peak_day_of_year) / self.filament_width_days)**2
-        density = 1 + (self.density_enhancement_factor - 1) * np.exp(exponent)
+        if np.ndim(doy) == 0:
+            x = (float(doy) - self.filament_peak_day_of_year) / self.filament_width_days
+            return 1 + (self.density_enhancement_factor - 1) * math.exp(-0.5 * x * x)
+        x = (np.asarray(doy, dtype=np.float64) - self.filament_peak_day_of_year) / self.filament_width_days
+        density = 1 + (self.density_enhancement_factor - 1) * np.exp(-0.5 * x**2)
         return density
 
-    def get_phase_transition_probability(self, density):
+    def get_phase_transition_probability(self, density, out=None):
         """
         Calcula la probabilidad de transición de fase basada en la densidad local.
+        Acepta un escalar o un np.ndarray; `out` permite reutilizar un búfer
+        preasignado del mismo tamaño que `density`.
         """
-        if density < self.rho_crit_normalized:
-            return 0.0
-        arg = self.k_factor * (density / self.rho_crit_normalized - 1)
-        probability = np.tanh(arg)
+        if np.ndim(density) == 0:
+            density = float(density)
+            if density < self.rho_crit_normalized:
+                return 0.0
+            return math.tanh(self.k_factor * (density / self.rho_crit_normalized - 1.0))
+        density = np.asarray(density, dtype=np.float64)
+        below = density < self.rho_crit_normalized
+        arg = self.k_factor * (density / self.rho_crit_normalized - 1.0)
+        probability = np.tanh(arg, out=out)
+        probability[below] = 0.0
         return probability
 
     def predict_relative_signal_rate(self, date_str):
         """
         Predice la tasa de eventos relativa esperada para una fecha específica.
+        La fecha debe ser 'YYYY-MM-DD' con mes y día de dos dígitos.
         """
         try:
-            input_date = datetime.strptime(date_str, '%Y-%m-%d')
-            if input_date.year != self.target_year:
-                return {"warning": f"Este predictor está calibrado para {self.target_year}."}
+            year = _parse_iso_year(date_str)
         except ValueError:
             return {"error": "Formato de fecha inválido. Use 'YYYY-MM-DD'."}
+        if year != self.target_year:
+            return {"warning": f"Este predictor está calibrado para {self.target_year}."}
+        try:
+            day_of_year = _parse_iso_day_of_year(date_str, year)
+        except ValueError:
+            return {"error": "Formato de fecha inválido. Use 'YYYY-MM-DD'."}
+
+        return float(self._rate_table[day_of_year])
+
+    def predict_relative_signal_rate_bulk(self, dates):
+        """
+        Predice la tasa de eventos relativa para una secuencia de fechas
+        (objetos date/datetime) en una única pasada vectorizada. Las fechas
+        fuera del año objetivo dan NaN.
+        """
+        pairs = np.array([(d.year, _day_of_year(d)) for d in dates], dtype=np.int32).reshape(-1, 2)
+        years = pairs[:, 0]
+        doys = pairs[:, 1]
+        local_density = self.get_relative_density_at_date(doys)
+        transition_prob = self.get_phase_transition_probability(
+            local_density, out=np.empty_like(local_density)
+        )
+        rates = 1.0 + 100 * transition_prob
+        rates[years != self.target_year] = np.nan
+        return rates
+
+    def predict_many(self, date_strs):
+        """
+        Predice la tasa de eventos relativa para una secuencia de cadenas
+        'YYYY-MM-DD' en una única pasada vectorizada. Las fechas fuera del año
+        objetivo dan NaN; lanza ValueError si alguna cadena es inválida.
+        """
+        year, day_of_year = _parse_iso_dates(date_strs)
+        rates = self._rate_table[day_of_year]
+        rates[year != self.target_year] = np.nan
+        return rates
+
+    def rate_at(self, doy):
+        """
+        Evalúa la tasa de eventos relativa para un día del año continuo
+        (admite fracciones de día), sin pasar por la tabla diaria.
+        Acepta un escalar o un np.ndarray.
+        """
+        if np.ndim(doy) == 0 or not HAVE_NUMBA:
+            density = self.get_relative_density_at_date(doy)
+            return 1.0 + 100 * self.get_phase_transition_probability(density)
+        doy = np.ascontiguousarray(doy, dtype=np.float64)
+        out = np.empty_like(doy)
+        _signal_rate_array(
+            out.reshape(-1),
+            doy.reshape(-1),
+            self.filament_peak_day_of_year,
+            self.filament_width_days,
+            self.density_enhancement_factor,
+            self.rho_crit_normalized,
+            self.k_factor,
+            self._u_crit,
+        )
+        return out
+
+    def batch(self):
+        """
+        Crea un lote para acumular fechas y evaluarlas juntas:
+
+            with predictor.batch() as b:
+                for date_str in fechas:
+                    b.add(date_str)
+                rates = b.result()
+        """
+        return _PredictionBatch(self)
+
+    def predict_year(self):
+        """
+        Predice la tasa de eventos relativa para todos los días del año objetivo.
+        El elemento i corresponde al día del año i + 1.
+        """
+        n_days = 366 if _is_leap(self.target_year) else 365
+        return self._rate_table[1:n_days + 1].copy()
+
+
+def get_predictor(year=2026):
+    """
+    Devuelve un predictor compartido para el año dado, evitando recalcular
+    sus tablas en cada construcción. No modifique la instancia devuelta.
+    """
+    return _get_predictor(int(year))
+
 
-        local_density = self.get_relative_density_at_date(input_date)
-        transition_prob = self.get_phase_transition_probability(local_density)
-        signal_rate = 1.0 + 100 * transition_prob
-        return signal_rate
+@lru_cache(maxsize=16)
+def _get_predictor(year):
+    return AnnualModulationPredictor(year)
 
 # --- Ejemplo de Uso ---
-# predictor_2026 = AnnualModulationPredictor(year=2026)
+# predictor_2026 = get_predictor(2026)
 # date_peak = "2026-06-04"
 # rate_peak = predictor_2026.predict_relative_signal_rate(date_peak)
 # print(f"Tasa de eventos relativa predicha para {date_peak}: {rate_peak:.2f}")
@@ -0,0 +1,253 @@
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from AMP_2026_Predictor import AnnualModulationPredictor, _parse_iso_date, _parse_iso_dates, get_predictor
+
+YEARS = [2026, 2024, 1900, 2000]
+
+MALFORMED = [
+    (2026, '2026-02-29'),
+    (1900, '1900-02-29'),
+    (2026, '2026-13-01'),
+    (2026, '2026-00-10'),
+    (2026, '2026-06-00'),
+    (2026, '2026-06-31'),
+    (2026, '2026-+6-04'),
+    (2026, '2026- 6-04'),
+    (2026, '2026-06-4 '),
+    (2026, '2026-٠٦-04'),
+    (2026, '2026/06/04'),
+    (2026, '2026-06-04T00'),
+    (2026, '20260604'),
+    (2026, ''),
+]
+
+
+def baseline_rate(predictor, date_str):
+    """
+    Implementación original (datetime.strptime + np.exp/np.tanh escalares).
+    """
+    input_date = datetime.strptime(date_str, '%Y-%m-%d')
+    day_of_year = input_date.timetuple().tm_yday
+    exponent = -0.5 * ((day_of_year - predictor.filament_peak_day_of_year) / predictor.filament_width_days)**2
+    density = 1 + (predictor.density_enhancement_factor - 1) * np.exp(exponent)
+    if density < predictor.rho_crit_normalized:
+        return 1.0
+    return 1.0 + 100 * np.tanh(predictor.k_factor * (density / predictor.rho_crit_normalized - 1))
+
+
+def all_days(year):
+    day = date(year, 1, 1)
+    while day.year == year:
+        yield day
+        day += timedelta(days=1)
+
+
+@pytest.mark.parametrize('year', YEARS)
+def test_parsers_match_datetime(year):
+    days = list(all_days(year))
+    strs = [d.isoformat() for d in days]
+    expected = [(d.year, d.timetuple().tm_yday) for d in days]
+    assert [_parse_iso_date(s) for s in strs] == expected
+    parsed_years, parsed_doys = _parse_iso_dates(strs)
+    assert list(zip(parsed_years.tolist(), parsed_doys.tolist())) == expected
+
+
+@pytest.mark.parametrize('year', YEARS)
+def test_predict_many_matches_baseline(year):
+    predictor = AnnualModulationPredictor(year)
+    strs = [d.isoformat() for d in all_days(year)]
+    expected = np.array([baseline_rate(predictor, s) for s in strs])
+    np.testing.assert_allclose(predictor.predict_many(strs), expected, rtol=1e-12)
+
+
+def test_predict_many_flags_other_year():
+    predictor = AnnualModulationPredictor(2026)
+    assert np.isnan(predictor.predict_many(['2026-06-04', '2024-06-04'])).tolist() == [False, True]
+
+
+@pytest.mark.parametrize('year,date_str', MALFORMED)
+def test_malformed_dates_rejected(year, date_str):
+    with pytest.raises(ValueError):
+        datetime.strptime(date_str, '%Y-%m-%d')
+    with pytest.raises(ValueError):
+        _parse_iso_date(date_str)
+    with pytest.raises(ValueError):
+        AnnualModulationPredictor(year).predict_many(['2026-06-04', date_str])
+
+
+@pytest.mark.parametrize('year', YEARS)
+def test_bulk_matches_baseline(year):
+    predictor = AnnualModulationPredictor(year)
+    days = list(all_days(year))
+    expected = np.array([baseline_rate(predictor, d.isoformat()) for d in days])
+    np.testing.assert_allclose(predictor.predict_relative_signal_rate_bulk(days), expected, rtol=1e-12)
+
+
+def test_bulk_accepts_generator_and_flags_other_year():
+    predictor = AnnualModulationPredictor(2026)
+    rates = predictor.predict_relative_signal_rate_bulk(
+        d for d in [date(2026, 6, 4), datetime(2026, 6, 4, 12), date(2024, 6, 4)]
+    )
+    assert np.isnan(rates).tolist() == [False, False, True]
+    assert rates[0] == rates[1] == predictor.predict_relative_signal_rate('2026-06-04')
+    assert predictor.predict_relative_signal_rate_bulk(iter([])).shape == (0,)
+
+
+def test_transition_probability_out_buffer():
+    predictor = AnnualModulationPredictor(2026)
+    density = predictor.get_relative_density_at_date(np.arange(1, 366))
+    expected = np.array([predictor.get_phase_transition_probability(d) for d in density])
+    assert expected.min() == 0.0 and expected.max() > 0.0
+
+    out = np.empty_like(density)
+    assert predictor.get_phase_transition_probability(density, out=out) is out
+    np.testing.assert_allclose(out, expected, rtol=1e-12)
+
+    in_place = density.copy()
+    assert predictor.get_phase_transition_probability(in_place, out=in_place) is in_place
+    np.testing.assert_allclose(in_place, expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize('year', YEARS)
+def test_predict_year_matches_baseline(year):
+    predictor = AnnualModulationPredictor(year)
+    expected = np.array([baseline_rate(predictor, d.isoformat()) for d in all_days(year)])
+    np.testing.assert_allclose(predictor.predict_year(), expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize('year', YEARS)
+def test_scalar_prediction_matches_baseline(year):
+    predictor = AnnualModulationPredictor(year)
+    for day in all_days(year):
+        date_str = day.isoformat()
+        assert predictor.predict_relative_signal_rate(date_str) == pytest.approx(
+            baseline_rate(predictor, date_str), rel=1e-12)
+
+
+@pytest.mark.parametrize('year,date_str', MALFORMED)
+def test_scalar_prediction_reports_malformed(year, date_str):
+    assert 'error' in AnnualModulationPredictor(year).predict_relative_signal_rate(date_str)
+
+
+@pytest.mark.parametrize('date_str', ['2026-6-4', '2026-06-4', '2026-6-04'])
+def test_unpadded_dates_rejected(date_str):
+    # datetime.strptime acepta estas fechas; el formato 'YYYY-MM-DD' es estricto.
+    datetime.strptime(date_str, '%Y-%m-%d')
+    predictor = AnnualModulationPredictor(2026)
+    assert 'error' in predictor.predict_relative_signal_rate(date_str)
+    with pytest.raises(ValueError):
+        _parse_iso_date(date_str)
+    with pytest.raises(ValueError):
+        predictor.predict_many([date_str])
+
+
+@pytest.mark.parametrize('year', YEARS)
+def test_batch_matches_baseline(year):
+    predictor = AnnualModulationPredictor(year)
+    strs = [d.isoformat() for d in all_days(year)]
+    expected = np.array([baseline_rate(predictor, s) for s in strs])
+    with predictor.batch() as b:
+        for s in strs:
+            b.add(s)
+        np.testing.assert_allclose(b.result(), expected, rtol=1e-12)
+        np.testing.assert_allclose(b.flush(), expected, rtol=1e-12)
+        assert b.result().shape == (0,)
+
+
+def test_batch_flags_other_year_and_rejects_malformed():
+    predictor = AnnualModulationPredictor(2026)
+    with predictor.batch() as b:
+        b.add('2026-06-04')
+        b.add('2024-06-04')
+        with pytest.raises(ValueError):
+            b.add('2026-02-29')
+        assert np.isnan(b.result()).tolist() == [False, True]
+
+
+def test_other_year_warning_precedes_format_check():
+    predictor = AnnualModulationPredictor(2026)
+    assert 'warning' in predictor.predict_relative_signal_rate('2024-06-04')
+    assert 'warning' in predictor.predict_relative_signal_rate('2025-13-01')
+    assert 'error' in predictor.predict_relative_signal_rate('2026-13-01')
+
+
+def test_rate_at_scalar_continuous_days():
+    predictor = AnnualModulationPredictor(2026)
+    year_rates = predictor.predict_year()
+    for doy in range(1, 366):
+        assert predictor.rate_at(doy) == pytest.approx(year_rates[doy - 1], rel=1e-12)
+    for doy in np.linspace(0.0, 366.0, 2001):
+        x = (doy - predictor.filament_peak_day_of_year) / predictor.filament_width_days
+        density = 1 + (predictor.density_enhancement_factor - 1) * np.exp(-0.5 * x**2)
+        expected = 1.0
+        if density >= predictor.rho_crit_normalized:
+            expected += 100 * np.tanh(predictor.k_factor * (density / predictor.rho_crit_normalized - 1))
+        assert predictor.rate_at(doy) == pytest.approx(expected, rel=1e-12)
+
+
+def test_rate_at_array_matches_scalar():
+    predictor = AnnualModulationPredictor(2026)
+    half_width = predictor.filament_width_days * np.sqrt(predictor._u_crit)
+    edges = predictor.filament_peak_day_of_year + np.array([-half_width, half_width])
+    doys = np.concatenate([
+        np.linspace(0.0, 366.0, 4001),
+        edges,
+        np.nextafter(edges, -np.inf),
+        np.nextafter(edges, np.inf),
+        edges[:, None] + np.linspace(-1e-3, 1e-3, 21),
+    ], axis=None)
+    expected = np.array([predictor.rate_at(float(d)) for d in doys])
+    np.testing.assert_allclose(predictor.rate_at(doys), expected, rtol=1e-12, atol=1e-12)
+    assert predictor.rate_at(doys.reshape(-1, 1)).shape == (doys.size, 1)
+
+
+def test_rate_at_propagates_nan():
+    predictor = AnnualModulationPredictor(2026)
+    assert np.isnan(predictor.rate_at(np.nan))
+    assert np.isnan(predictor.rate_at(np.array([np.nan, 155.0]))).tolist() == [True, False]
+
+
+def test_get_predictor_is_shared():
+    predictor = get_predictor()
+    assert predictor is get_predictor(2026)
+    assert predictor is get_predictor(year=2026)
+    assert predictor is get_predictor(2026.0)
+    assert get_predictor(2024) is not predictor
+    assert get_predictor(2024).target_year == 2024
+
+
+def test_shared_predictor_is_protected():
+    predictor = get_predictor(2026)
+    with pytest.raises(ValueError):
+        predictor._rate_table[155] = 0.0
+    with pytest.raises(AttributeError):
+        predictor.unknown_parameter = 1.0
+    assert not hasattr(predictor, '__dict__')
+
+
+def test_scalar_density_and_probability_match_array_path():
+    predictor = AnnualModulationPredictor(2026)
+    doys = np.linspace(0.0, 366.0, 1001)
+    density = predictor.get_relative_density_at_date(doys)
+    probability = predictor.get_phase_transition_probability(density)
+    for doy, d, prob in zip(doys, density, probability):
+        scalar_density = predictor.get_relative_density_at_date(doy)
+        assert isinstance(scalar_density, float)
+        assert scalar_density == pytest.approx(d, rel=1e-12)
+        assert predictor.get_phase_transition_probability(scalar_density) == pytest.approx(prob, rel=1e-12, abs=1e-15)
+
+
+@pytest.mark.parametrize('year', [2026.0, 0, 12000])
+def test_constructor_accepts_any_year(year):
+    predictor = AnnualModulationPredictor(year)
+    assert predictor.target_year == year
+
+
+def test_bulk_day_of_year_from_datetimes():
+    predictor = AnnualModulationPredictor(2024)
+    days = [datetime(2024, 12, 31, 23, 59), datetime(2024, 2, 29, 0, 1)]
+    expected = [predictor.predict_relative_signal_rate(d.strftime('%Y-%m-%d')) for d in days]
+    np.testing.assert_allclose(predictor.predict_relative_signal_rate_bulk(days), expected, rtol=1e-12)